@@ -5,114 +5,234 @@ This Lambda function orchestrates the Bedrock AgentCore workflow for autonomous
 GitHub issue resolution, including reasoning, tool execution, and result reporting.
 """
 
+import concurrent.futures
 import json
 import os
 import logging
+import threading
+import time
 import boto3
+import botocore.config
 from typing import Dict, Any, List
 from datetime import datetime, timezone
 
+from tools.github_tool import GitHubTool
+from tools.codebuild_tool import CodeBuildTool
+from tools.s3_tool import S3Tool
+
+# Optional DAX support for microsecond-latency memory reads
+try:
+    from amazondax import AmazonDaxClient
+except ImportError:
+    AmazonDaxClient = None
+
+# orjson is a C-extension codec several times faster than stdlib json on
+# the multi-KB Bedrock and response payloads; fall back to stdlib when
+# the wheel is not packaged
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(data: Any) -> Any:
+        return orjson.loads(data)
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=str).encode('utf-8')
+
+    def _json_loads(data: Any) -> Any:
+        return json.loads(data)
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Shared HTTP config so warm invocations reuse pooled TLS connections
+# instead of paying a TCP+TLS handshake on every AWS call
+AWS_CLIENT_CONFIG = botocore.config.Config(
+    tcp_keepalive=True,
+    max_pool_connections=16,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    connect_timeout=2,
+    read_timeout=60
+)
+
+# Bedrock throttles in bursts under load; adaptive mode rate-limits
+# retries client-side instead of herding them, and inference needs a
+# longer read timeout than the control-plane calls
+BEDROCK_CLIENT_CONFIG = AWS_CLIENT_CONFIG.merge(botocore.config.Config(
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    read_timeout=120
+))
+
 # Initialize AWS clients
-bedrock_client = boto3.client('bedrock-runtime')
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-codebuild_client = boto3.client('codebuild')
+bedrock_client = boto3.client('bedrock-runtime', config=BEDROCK_CLIENT_CONFIG)
+s3_client = boto3.client('s3', config=AWS_CLIENT_CONFIG)
+dynamodb = boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG)
+codebuild_client = boto3.client('codebuild', config=AWS_CLIENT_CONFIG)
 
 # Environment variables
 BEDROCK_MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20241022')
 S3_BUCKET = os.environ.get('S3_BUCKET')
 CODEBUILD_PROJECT = os.environ.get('CODEBUILD_PROJECT')
 MEMORY_TABLE_NAME = os.environ.get('MEMORY_TABLE')
+MEMORY_SUMMARY_INDEX = os.environ.get('MEMORY_SUMMARY_INDEX', 'gsi_issue_summary')
+BEDROCK_LATENCY_OPT = os.environ.get('BEDROCK_LATENCY_OPT', '1') == '1'
+
+# Tool singletons, constructed on first use and reused for the life of
+# the container so their boto3 clients and HTTP sessions stay pooled.
+# Construction stays lazy because GitHubTool requires GITHUB_TOKEN.
+_tools: Dict[str, Any] = {}
+_tools_lock = threading.Lock()
+
+def _get_tools() -> tuple:
+    """
+    Return the shared (GitHubTool, CodeBuildTool, S3Tool) instances.
+
+    Returns:
+        Tuple of tool singletons
+    """
+    with _tools_lock:
+        if not _tools:
+            _tools['github'] = GitHubTool()
+            _tools['codebuild'] = CodeBuildTool()
+            _tools['s3'] = S3Tool()
+    return _tools['github'], _tools['codebuild'], _tools['s3']
 
-# Initialize DynamoDB table
-memory_table = dynamodb.Table(MEMORY_TABLE_NAME) if MEMORY_TABLE_NAME else None
+# Initialize DynamoDB table, routed through DAX when an endpoint is configured
+DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT')
+if DAX_ENDPOINT and AmazonDaxClient:
+    _memory_resource = AmazonDaxClient.resource(endpoint_url=DAX_ENDPOINT)
+else:
+    _memory_resource = dynamodb
+memory_table = _memory_resource.Table(MEMORY_TABLE_NAME) if MEMORY_TABLE_NAME else None
+
+# In-process TTL cache for memory queries; webhook retries and edited
+# events revisit the same issue_id within seconds
+MEMORY_CACHE_TTL = 60  # seconds
+MEMORY_CACHE_MAX_ENTRIES = 512
+_memory_cache: Dict[str, Any] = {}
+
+def _query_memory(issue_id: str) -> List[Dict[str, Any]]:
+    """
+    Query DynamoDB (or DAX) for agent memory, caching results per warm container.
+
+    Args:
+        issue_id: GitHub issue ID
+
+    Returns:
+        List of memory items for the issue
+    """
+    now = time.monotonic()
+    cached = _memory_cache.get(issue_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    # Query the summary GSI, which projects only the attributes the
+    # prompt actually renders, instead of pulling full resolution maps
+    response = memory_table.query(
+        IndexName=MEMORY_SUMMARY_INDEX,
+        KeyConditionExpression='issue_id = :issue_id',
+        ExpressionAttributeValues={':issue_id': issue_id},
+        ProjectionExpression='summary, #ts',
+        ExpressionAttributeNames={'#ts': 'timestamp'},
+        Limit=3,  # build_agent_prompt renders at most 3 items
+        ScanIndexForward=False
+    )
+    items = response.get('Items', [])
+
+    # Bound cache size for long-lived containers
+    if len(_memory_cache) >= MEMORY_CACHE_MAX_ENTRIES:
+        _memory_cache.clear()
+    _memory_cache[issue_id] = (now + MEMORY_CACHE_TTL, items)
+
+    return items
 
 def get_agent_memory(issue_id: str) -> List[Dict[str, Any]]:
     """
     Retrieve agent memory for similar issues to improve reasoning.
-    
+
     Args:
         issue_id: GitHub issue ID
-        
+
     Returns:
         List of similar past issues and their resolutions
     """
     if not memory_table:
         return []
-    
+
     try:
-        response = memory_table.query(
-            KeyConditionExpression='issue_id = :issue_id',
-            ExpressionAttributeValues={':issue_id': issue_id},
-            Limit=5,
-            ScanIndexForward=False
-        )
-        return response.get('Items', [])
+        return _query_memory(issue_id)
     except Exception as e:
         logger.warning(f"Failed to retrieve agent memory: {e}")
         return []
 
-def store_agent_memory(issue_id: str, resolution: Dict[str, Any]) -> None:
+# Buffered memory writes, flushed as DynamoDB batch chunks instead of
+# one PutItem round-trip per issue
+MEMORY_WRITE_BATCH_SIZE = 25  # DynamoDB BatchWriteItem maximum
+_memory_write_buffer: List[Dict[str, Any]] = []
+_memory_write_lock = threading.Lock()
+
+def store_agent_memory(issue_id: str, resolution: Dict[str, Any],
+                       now: datetime = None) -> None:
     """
-    Store agent resolution in memory for future learning.
-    
+    Buffer an agent resolution for batched storage in memory.
+
     Args:
         issue_id: GitHub issue ID
         resolution: Resolution details to store
+        now: Invocation timestamp (defaults to current time)
     """
     if not memory_table:
         return
-    
-    try:
-        memory_table.put_item(
-            Item={
-                'issue_id': issue_id,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'resolution': resolution,
-                'ttl': int(datetime.now(timezone.utc).timestamp()) + (30 * 24 * 60 * 60)  # 30 days
-            }
-        )
-    except Exception as e:
-        logger.warning(f"Failed to store agent memory: {e}")
 
-def build_agent_prompt(issue_context: Dict[str, Any], repo_context: Dict[str, Any], 
-                      memory: List[Dict[str, Any]]) -> str:
+    now = now or datetime.now(timezone.utc)
+    item = {
+        'issue_id': issue_id,
+        'timestamp': now.isoformat(),
+        'resolution': resolution,
+        # Top-level copy projected into the summary GSI so reads never
+        # have to fetch the full resolution map
+        'summary': resolution.get('summary') or resolution.get('reasoning', ''),
+        'ttl': int(now.timestamp()) + (30 * 24 * 60 * 60)  # 30 days
+    }
+
+    with _memory_write_lock:
+        _memory_write_buffer.append(item)
+        # Drop the stale cache entry so the next read sees this resolution
+        _memory_cache.pop(issue_id, None)
+        should_flush = len(_memory_write_buffer) >= MEMORY_WRITE_BATCH_SIZE
+
+    if should_flush:
+        flush_agent_memory()
+
+def flush_agent_memory() -> None:
     """
-    Build the agent prompt for Bedrock LLM reasoning.
-    
-    Args:
-        issue_context: GitHub issue context
-        repo_context: Repository context
-        memory: Agent memory from similar issues
-        
-    Returns:
-        Formatted prompt for the LLM
+    Flush buffered resolutions to DynamoDB in a single batch write.
     """
-    memory_context = ""
-    if memory:
-        memory_context = "\n\nSimilar past issues and resolutions:\n"
-        for item in memory[:3]:  # Limit to 3 similar issues
-            memory_context += f"- {item.get('resolution', {}).get('summary', 'N/A')}\n"
-    
-    prompt = f"""You are an autonomous engineering agent specialized in GitHub issue resolution.
+    if not memory_table:
+        return
 
-REPOSITORY CONTEXT:
-- Repository: {repo_context.get('full_name', 'Unknown')}
-- Language: {repo_context.get('language', 'Unknown')}
-- Default Branch: {repo_context.get('default_branch', 'main')}
-- Private: {repo_context.get('private', False)}
+    with _memory_write_lock:
+        pending = _memory_write_buffer[:]
+        _memory_write_buffer.clear()
 
-ISSUE TO RESOLVE:
-- Title: {issue_context.get('title', 'No title')}
-- Description: {issue_context.get('body', 'No description')}
-- Labels: {', '.join(issue_context.get('labels', []))}
-- Issue Number: #{issue_context.get('number', 'Unknown')}
+    if not pending:
+        return
 
-{memory_context}
+    try:
+        with memory_table.batch_writer() as batch:
+            for item in pending:
+                batch.put_item(Item=item)
+    except Exception as e:
+        logger.warning(f"Failed to store agent memory: {e}")
+
+# The instructional half of the prompt is identical for every issue, so
+# it ships as a Bedrock `system` block with a cache_control marker; the
+# byte-stable prefix lets Bedrock reuse its prompt (KV) cache across
+# invocations, cutting input-token cost and time-to-first-token
+_STATIC_SYSTEM = """You are an autonomous engineering agent specialized in GitHub issue resolution.
 
 AVAILABLE TOOLS:
 1. github_tool: Create branches, apply patches, open pull requests
@@ -120,7 +240,7 @@ AVAILABLE TOOLS:
 3. s3_tool: Store artifacts and logs
 
 TASK:
-Analyze this issue and determine if it can be automatically resolved. If yes, provide:
+Analyze the issue and determine if it can be automatically resolved. If yes, provide:
 1. A minimal code patch (unified diff format)
 2. Test cases to validate the fix
 3. A clear explanation of the changes
@@ -133,7 +253,7 @@ CONSTRAINTS:
 - If uncertain, suggest human review
 
 RESPONSE FORMAT (JSON):
-{{
+{
     "can_auto_fix": true/false,
     "confidence": 0.0-1.0,
     "reasoning": "Why this can/cannot be auto-fixed",
@@ -142,58 +262,161 @@ RESPONSE FORMAT (JSON):
     "explanation": "Clear explanation of changes",
     "estimated_time": "Estimated time to implement",
     "risk_level": "low/medium/high"
-}}
+}
 
 If can_auto_fix is false, provide detailed reasoning and suggest next steps for human intervention."""
 
-    return prompt
+# Per-issue half of the prompt; a single format pass per call
+_USER_TEMPLATE = """REPOSITORY CONTEXT:
+- Repository: {repo_full_name}
+- Language: {repo_language}
+- Default Branch: {repo_default_branch}
+- Private: {repo_private}
+
+ISSUE TO RESOLVE:
+- Title: {issue_title}
+- Description: {issue_body}
+- Labels: {issue_labels}
+- Issue Number: #{issue_number}
+{memory_context}"""
+
+def build_agent_prompt(issue_context: Dict[str, Any], repo_context: Dict[str, Any],
+                      memory: List[Dict[str, Any]]) -> str:
+    """
+    Build the issue-specific user prompt for Bedrock LLM reasoning.
+
+    The static instructions (tools, constraints, response format) are sent
+    separately as the system message so they stay byte-identical across
+    requests.
+
+    Args:
+        issue_context: GitHub issue context
+        repo_context: Repository context
+        memory: Agent memory from similar issues
+
+    Returns:
+        Formatted prompt for the LLM
+    """
+    memory_context = ""
+    if memory:
+        memory_context = "\n\nSimilar past issues and resolutions:\n"
+        for item in memory[:3]:  # Limit to 3 similar issues
+            summary = item.get('summary') or item.get('resolution', {}).get('summary', 'N/A')
+            memory_context += f"- {summary}\n"
+
+    return _USER_TEMPLATE.format(
+        repo_full_name=repo_context.get('full_name', 'Unknown'),
+        repo_language=repo_context.get('language', 'Unknown'),
+        repo_default_branch=repo_context.get('default_branch', 'main'),
+        repo_private=repo_context.get('private', False),
+        issue_title=issue_context.get('title', 'No title'),
+        issue_body=issue_context.get('body', 'No description'),
+        issue_labels=', '.join(issue_context.get('labels', [])),
+        issue_number=issue_context.get('number', 'Unknown'),
+        memory_context=memory_context
+    )
+
+# Byte-level Bedrock request template; everything except the user prompt
+# (including the JSON-escaped system block and its cache_control marker)
+# is serialized once at import, so per call only the prompt is encoded
+_BODY_PREFIX = (
+    b'{"anthropic_version":"bedrock-2023-05-31","max_tokens":4000,'
+    b'"system":[{"type":"text","text":'
+    + json.dumps(_STATIC_SYSTEM).encode('utf-8')
+    + b',"cache_control":{"type":"ephemeral"}}],'
+    b'"messages":[{"role":"user","content":'
+)
+_BODY_SUFFIX = b'}]}'
+
+def _collect_streamed_text(stream: Any) -> str:
+    """
+    Accumulate text deltas from a Bedrock response stream.
+
+    Stops reading as soon as a complete top-level JSON object has been
+    received, so the handler does not wait for trailing tokens.
+
+    Args:
+        stream: EventStream from invoke_model_with_response_stream
+
+    Returns:
+        Accumulated response text
+    """
+    parts = []
+    depth = 0
+    seen_brace = False
+
+    for event in stream:
+        chunk = _json_loads(event['chunk']['bytes'])
+        delta = chunk.get('delta', {}).get('text', '')
+        if not delta:
+            # message_start / content_block_stop events carry no text
+            continue
+
+        parts.append(delta)
+
+        # Track brace depth; when it returns to zero, verify we really
+        # hold a complete JSON object and stop reading the stream
+        for char in delta:
+            if char == '{':
+                depth += 1
+                seen_brace = True
+            elif char == '}':
+                depth -= 1
+
+        if seen_brace and depth <= 0:
+            text = ''.join(parts)
+            start = text.find('{')
+            try:
+                json.JSONDecoder().raw_decode(text, start)
+                return text
+            except (json.JSONDecodeError, ValueError):
+                pass
+
+    return ''.join(parts)
 
 def call_bedrock_agent(prompt: str) -> Dict[str, Any]:
     """
     Call Bedrock LLM for agent reasoning.
-    
+
     Args:
         prompt: Agent prompt
-        
+
     Returns:
         Agent response as dictionary
     """
     try:
-        # Prepare the request body for Claude
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 4000,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
-        
+        # Splice the JSON-escaped prompt into the pre-serialized body
+        # template; only the prompt varies between calls
+        body = _BODY_PREFIX + _json_dumps(prompt) + _BODY_SUFFIX
+
         # Call Bedrock
-        response = bedrock_client.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            body=json.dumps(request_body),
-            contentType="application/json",
-            accept="application/json"
-        )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read())
-        
-        # Extract content from Claude's response
-        content = response_body.get('content', [])
-        if content and len(content) > 0:
-            text_content = content[0].get('text', '')
-            
-            # Try to parse JSON from the response
+        invoke_args = {
+            'modelId': BEDROCK_MODEL_ID,
+            'body': body,
+            'contentType': "application/json",
+            'accept': "application/json"
+        }
+
+        # Route to latency-optimized capacity; the LLM call dominates
+        # handler wall time, so this is the biggest single latency lever
+        if BEDROCK_LATENCY_OPT:
+            invoke_args['performanceConfigLatency'] = 'optimized'
+
+        # Stream the response so decoding overlaps generation instead of
+        # blocking until the full body has been serialized
+        response = bedrock_client.invoke_model_with_response_stream(**invoke_args)
+
+        text_content = _collect_streamed_text(response['body'])
+
+        if text_content:
+
+            # Try to parse JSON from the response with a single forward
+            # scan; a greedy regex over a 4000-token response backtracks badly
             try:
-                # Look for JSON in the response
-                import re
-                json_match = re.search(r'\{.*\}', text_content, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
+                start = text_content.find('{')
+                if start != -1:
+                    parsed, _ = json.JSONDecoder().raw_decode(text_content, start)
+                    return parsed
                 else:
                     # Fallback: return structured response
                     return {
@@ -224,19 +447,21 @@ def call_bedrock_agent(prompt: str) -> Dict[str, Any]:
             "reasoning": f"Bedrock API error: {str(e)}"
         }
 
-def execute_agent_actions(agent_response: Dict[str, Any], issue_context: Dict[str, Any], 
-                         repo_context: Dict[str, Any]) -> Dict[str, Any]:
+def execute_agent_actions(agent_response: Dict[str, Any], issue_context: Dict[str, Any],
+                         repo_context: Dict[str, Any], now: datetime = None) -> Dict[str, Any]:
     """
     Execute the actions determined by the agent.
-    
+
     Args:
         agent_response: Agent's reasoning and actions
         issue_context: GitHub issue context
         repo_context: Repository context
-        
+        now: Invocation timestamp (defaults to current time)
+
     Returns:
         Execution results
     """
+    now = now or datetime.now(timezone.utc)
     results = {
         "success": False,
         "actions_taken": [],
@@ -249,65 +474,64 @@ def execute_agent_actions(agent_response: Dict[str, Any], issue_context: Dict[st
         return results
     
     try:
-        # Import tools
-        from tools.github_tool import GitHubTool
-        from tools.codebuild_tool import CodeBuildTool
-        from tools.s3_tool import S3Tool
-        
-        # Initialize tools
-        github_tool = GitHubTool()
-        codebuild_tool = CodeBuildTool()
-        s3_tool = S3Tool()
-        
-        # Create branch
-        branch_name = f"autofix-{issue_context.get('number', 'unknown')}-{int(datetime.now().timestamp())}"
-        branch_result = github_tool.create_branch(
-            repo_context.get('full_name'),
-            branch_name,
-            repo_context.get('default_branch', 'main')
-        )
-        
-        if branch_result.get('success'):
-            results["actions_taken"].append(f"Created branch: {branch_name}")
-        else:
-            results["errors"].append(f"Failed to create branch: {branch_result.get('error')}")
-            return results
-        
-        # Apply patch if provided
-        if agent_response.get("patch"):
-            patch_result = github_tool.apply_patch(
-                repo_context.get('full_name'),
-                branch_name,
-                agent_response.get("patch"),
-                f"AutoFix: {issue_context.get('title', 'Issue resolution')}"
+        # Reuse the per-container tool singletons
+        github_tool, codebuild_tool, s3_tool = _get_tools()
+
+        full_name = repo_context.get('full_name')
+        branch_name = f"autofix-{issue_context.get('number', 'unknown')}-{int(now.timestamp())}"
+
+        # Fatal steps run serially from one table: (name, success note,
+        # callable, args). Each must succeed before the next runs, and a
+        # failure records the error and aborts — one guard instead of a
+        # copy of the same if/else per step.
+        serial_steps = [
+            (
+                "create branch",
+                f"Created branch: {branch_name}",
+                github_tool.create_branch,
+                (full_name, branch_name, repo_context.get('default_branch', 'main'))
             )
-            
-            if patch_result.get('success'):
-                results["actions_taken"].append("Applied code patch")
+        ]
+
+        if agent_response.get("patch"):
+            serial_steps.append((
+                "apply patch",
+                "Applied code patch",
+                github_tool.apply_patch,
+                (full_name, branch_name, agent_response.get("patch"),
+                 f"AutoFix: {issue_context.get('title', 'Issue resolution')}")
+            ))
+
+        for step_name, success_note, step_func, step_args in serial_steps:
+            step_result = step_func(*step_args)
+            if step_result.get('success'):
+                results["actions_taken"].append(success_note)
             else:
-                results["errors"].append(f"Failed to apply patch: {patch_result.get('error')}")
+                results["errors"].append(f"Failed to {step_name}: {step_result.get('error')}")
                 return results
-        
-        # Run tests
-        if CODEBUILD_PROJECT:
-            test_result = codebuild_tool.run_tests(
-                CODEBUILD_PROJECT,
-                repo_context.get('full_name'),
-                branch_name
-            )
-            
-            if test_result.get('success'):
-                results["actions_taken"].append("Triggered automated tests")
-                results["test_build_id"] = test_result.get('build_id')
-            else:
-                results["errors"].append(f"Failed to run tests: {test_result.get('error')}")
-        
-        # Create pull request
-        pr_result = github_tool.create_pull_request(
-            repo_context.get('full_name'),
-            branch_name,
-            f"[AutoFix] {issue_context.get('title', 'Issue resolution')}",
-            f"""## 🤖 AutoFix Agent Resolution
+
+        # Render the test-case list once, outside the PR body f-string
+        test_cases_block = "\n".join(f"- {case}" for case in agent_response.get("test_cases") or ())
+
+        # Once the patch is on the branch, the CodeBuild test run and the
+        # pull request are independent; issue them concurrently so the
+        # handler pays max(test_time, pr_time) instead of the sum
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            test_future = None
+            if CODEBUILD_PROJECT:
+                test_future = executor.submit(
+                    codebuild_tool.run_tests,
+                    CODEBUILD_PROJECT,
+                    full_name,
+                    branch_name
+                )
+
+            pr_future = executor.submit(
+                github_tool.create_pull_request,
+                full_name,
+                branch_name,
+                f"[AutoFix] {issue_context.get('title', 'Issue resolution')}",
+                f"""## 🤖 AutoFix Agent Resolution
 
 **Issue:** #{issue_context.get('number')}
 **Confidence:** {agent_response.get('confidence', 0):.1%}
@@ -317,7 +541,7 @@ def execute_agent_actions(agent_response: Dict[str, Any], issue_context: Dict[st
 {agent_response.get('explanation', 'N/A')}
 
 ### Test Cases
-{chr(10).join(f"- {case}" for case in agent_response.get('test_cases', []))}
+{test_cases_block}
 
 ### Risk Assessment
 - **Level:** {agent_response.get('risk_level', 'unknown').title()}
@@ -326,26 +550,36 @@ def execute_agent_actions(agent_response: Dict[str, Any], issue_context: Dict[st
 ---
 *This PR was automatically generated by the AutoTriage & AutoFix Agent.*
 """,
-            repo_context.get('default_branch', 'main')
-        )
-        
+                repo_context.get('default_branch', 'main')
+            )
+
+            pr_result = pr_future.result()
+            test_result = test_future.result() if test_future else None
+
+        if test_result is not None:
+            if test_result.get('success'):
+                results["actions_taken"].append("Triggered automated tests")
+                results["test_build_id"] = test_result.get('build_id')
+            else:
+                results["errors"].append(f"Failed to run tests: {test_result.get('error')}")
+
         if pr_result.get('success'):
             results["actions_taken"].append("Created pull request")
             results["pr_url"] = pr_result.get('pr_url')
             results["success"] = True
         else:
             results["errors"].append(f"Failed to create PR: {pr_result.get('error')}")
-        
+
         # Store artifacts in S3
         if S3_BUCKET:
             artifact_data = {
                 "issue_context": issue_context,
                 "agent_response": agent_response,
                 "execution_results": results,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": now.isoformat()
             }
             
-            artifact_key = f"resolutions/{issue_context.get('id')}/{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            artifact_key = f"resolutions/{issue_context.get('id')}/{now.strftime('%Y%m%d_%H%M%S')}.json"
             s3_result = s3_tool.store_artifact(S3_BUCKET, artifact_key, artifact_data)
             
             if s3_result.get('success'):
@@ -359,80 +593,142 @@ def execute_agent_actions(agent_response: Dict[str, Any], issue_context: Dict[st
     
     return results
 
+def process_issue(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the full agent workflow for a single issue event.
+
+    Args:
+        payload: Issue event payload (issue, repository, action)
+
+    Returns:
+        dict: Processing results for the issue
+    """
+    # Extract event data
+    issue_context = payload.get('issue', {})
+    repo_context = payload.get('repository', {})
+    action = payload.get('action', '')
+
+    # One timestamp per invocation keeps branch names, artifact keys, and
+    # memory records consistent and avoids repeated clock reads
+    now = datetime.now(timezone.utc)
+
+    logger.info(f"Processing issue #{issue_context.get('number')} in {repo_context.get('full_name')}")
+
+    # Get agent memory for similar issues
+    memory = get_agent_memory(str(issue_context.get('id', '')))
+
+    # Build agent prompt
+    prompt = build_agent_prompt(issue_context, repo_context, memory)
+
+    # Call Bedrock agent
+    logger.info("Calling Bedrock agent for reasoning...")
+    agent_response = call_bedrock_agent(prompt)
+
+    logger.info(f"Agent response: {agent_response.get('can_auto_fix', False)} "
+               f"(confidence: {agent_response.get('confidence', 0):.1%})")
+
+    # Execute agent actions if auto-fix is possible
+    execution_results = {}
+    if agent_response.get('can_auto_fix', False):
+        logger.info("Executing agent actions...")
+        execution_results = execute_agent_actions(agent_response, issue_context, repo_context, now)
+    else:
+        logger.info("Agent determined issue cannot be auto-fixed")
+        execution_results = {
+            "success": False,
+            "reason": agent_response.get('reasoning', 'Issue cannot be auto-fixed'),
+            "confidence": agent_response.get('confidence', 0)
+        }
+
+    # Store resolution in memory
+    resolution_data = {
+        "issue_id": issue_context.get('id'),
+        "issue_number": issue_context.get('number'),
+        "can_auto_fix": agent_response.get('can_auto_fix', False),
+        "confidence": agent_response.get('confidence', 0),
+        "reasoning": agent_response.get('reasoning', ''),
+        "execution_success": execution_results.get('success', False),
+        "actions_taken": execution_results.get('actions_taken', []),
+        "errors": execution_results.get('errors', [])
+    }
+
+    store_agent_memory(str(issue_context.get('id', '')), resolution_data, now)
+
+    # Log results
+    logger.info(f"Processing complete for issue #{issue_context.get('number')}: "
+               f"success={execution_results.get('success', False)}")
+
+    return {
+        'issue_number': issue_context.get('number'),
+        'repository': repo_context.get('full_name'),
+        'agent_response': agent_response,
+        'execution_results': execution_results,
+        'timestamp': now.isoformat()
+    }
+
+def _process_issue_safe(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process one issue from a batch, converting failures into result entries
+    so one bad record does not fail the whole batch.
+
+    Args:
+        payload: Issue event payload
+
+    Returns:
+        dict: Processing results or error entry
+    """
+    try:
+        return process_issue(payload)
+    except Exception as e:
+        logger.error(f"Error processing batched issue: {str(e)}", exc_info=True)
+        return {
+            'issue_number': payload.get('issue', {}).get('number'),
+            'error': 'Agent orchestration failed',
+            'message': str(e)
+        }
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler for agent orchestration.
-    
+
+    Accepts either a single issue payload (direct invocation from the
+    webhook handler) or an SQS batch of issue payloads in event['Records'],
+    which are processed concurrently to amortize per-invocation overhead.
+
     Args:
         event: Lambda event object
         context: Lambda context object
-        
+
     Returns:
         dict: Processing results
     """
     try:
-        # Extract event data
-        issue_context = event.get('issue', {})
-        repo_context = event.get('repository', {})
-        action = event.get('action', '')
-        
-        logger.info(f"Processing issue #{issue_context.get('number')} in {repo_context.get('full_name')}")
-        
-        # Get agent memory for similar issues
-        memory = get_agent_memory(str(issue_context.get('id', '')))
-        
-        # Build agent prompt
-        prompt = build_agent_prompt(issue_context, repo_context, memory)
-        
-        # Call Bedrock agent
-        logger.info("Calling Bedrock agent for reasoning...")
-        agent_response = call_bedrock_agent(prompt)
-        
-        logger.info(f"Agent response: {agent_response.get('can_auto_fix', False)} "
-                   f"(confidence: {agent_response.get('confidence', 0):.1%})")
-        
-        # Execute agent actions if auto-fix is possible
-        execution_results = {}
-        if agent_response.get('can_auto_fix', False):
-            logger.info("Executing agent actions...")
-            execution_results = execute_agent_actions(agent_response, issue_context, repo_context)
-        else:
-            logger.info("Agent determined issue cannot be auto-fixed")
-            execution_results = {
-                "success": False,
-                "reason": agent_response.get('reasoning', 'Issue cannot be auto-fixed'),
-                "confidence": agent_response.get('confidence', 0)
+        records = event.get('Records')
+        if records:
+            # SQS batch: process issues concurrently; boto3 clients are
+            # thread-safe and the work is dominated by network I/O
+            payloads = [_json_loads(record['body']) for record in records]
+            max_workers = min(len(payloads), 8)
+
+            logger.info(f"Processing batch of {len(payloads)} issues with {max_workers} workers")
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                batch_results = list(executor.map(_process_issue_safe, payloads))
+
+            return {
+                'statusCode': 200,
+                'body': _json_dumps({
+                    'batch_size': len(batch_results),
+                    'results': batch_results
+                }).decode('utf-8')
             }
-        
-        # Store resolution in memory
-        resolution_data = {
-            "issue_id": issue_context.get('id'),
-            "issue_number": issue_context.get('number'),
-            "can_auto_fix": agent_response.get('can_auto_fix', False),
-            "confidence": agent_response.get('confidence', 0),
-            "reasoning": agent_response.get('reasoning', ''),
-            "execution_success": execution_results.get('success', False),
-            "actions_taken": execution_results.get('actions_taken', []),
-            "errors": execution_results.get('errors', [])
-        }
-        
-        store_agent_memory(str(issue_context.get('id', '')), resolution_data)
-        
-        # Log results
-        logger.info(f"Processing complete for issue #{issue_context.get('number')}: "
-                   f"success={execution_results.get('success', False)}")
-        
+
+        # Direct invocation: single issue payload
         return {
             'statusCode': 200,
-            'body': json.dumps({
-                'issue_number': issue_context.get('number'),
-                'repository': repo_context.get('full_name'),
-                'agent_response': agent_response,
-                'execution_results': execution_results,
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
+            'body': json.dumps(process_issue(event))
         }
-        
+
     except Exception as e:
         logger.error(f"Error in agent orchestrator: {str(e)}", exc_info=True)
         return {
@@ -442,3 +738,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'message': str(e)
             })
         }
+    finally:
+        # Persist any resolutions still buffered before the container freezes
+        flush_agent_memory()
@@ -5,24 +5,91 @@ This module provides AWS CodeBuild integration for running automated tests
 as part of the autonomous agent workflow.
 """
 
+import concurrent.futures
 import os
 import json
 import logging
+import random
+import threading
+import time
 import boto3
-from typing import Dict, Any, Optional
+import botocore.config
+from botocore.exceptions import BotoCoreError, ClientError
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Module-level clients so warm Lambda invocations reuse credentials and
+# keep-alive connections instead of re-resolving both per tool instance
+CLIENT_CONFIG = botocore.config.Config(
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'total_max_attempts': 5}
+)
+_codebuild_client = boto3.client('codebuild', config=CLIENT_CONFIG)
+_logs_client = boto3.client('logs', config=CLIENT_CONFIG)
+
+# Shared worker pool for background tasks (log tailers); persists for
+# the container lifetime so run_tests doesn't pay pool setup/teardown
+# per invocation
+_background_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=16, thread_name_prefix='codebuild-tool'
+)
+
+# Env-var override type; hoisted so the per-variable dicts in
+# start_build share one string reference
+_PT = 'PLAINTEXT'
+
+# Short-TTL status cache with per-build single-flight locks: the wait
+# loop, the log tailer and external callers all ask about the same
+# build within the same second, and terminal statuses never change
+_STATUS_CACHE_TTL = 1.0
+_STATUS_CACHE_MAX = 512
+_status_cache: Dict[str, Any] = {}
+_status_locks: Dict[str, threading.Lock] = {}
+_status_guard = threading.Lock()
+
+
+@dataclass(slots=True)
+class BuildSummary:
+    """
+    Per-build record returned by list_builds.
+
+    Slotted so a 100-build listing allocates fixed-layout objects
+    instead of 100 string-keyed dicts.
+    """
+    id: str
+    status: str
+    phase: str
+    start_time: Optional[str]
+    end_time: Optional[str]
+    duration: Optional[int]
+    project_name: Optional[str]
+    source_version: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict view for JSON boundaries and legacy callers."""
+        return asdict(self)
+
 class CodeBuildTool:
     """AWS CodeBuild integration tool for automated testing."""
     
+    # Build statuses that mean the build has finished
+    TERMINAL_STATUSES = ('SUCCEEDED', 'FAILED', 'STOPPED', 'TIMED_OUT')
+
     def __init__(self):
         """Initialize CodeBuild tool with AWS credentials."""
-        self.client = boto3.client('codebuild')
-        self.logs_client = boto3.client('logs')
-        
+        self.client = _codebuild_client
+        self.logs_client = _logs_client
+
+        # When an EventBridge "Build State Change" rule feeds this queue,
+        # completion is consumed as a push notification instead of polling
+        # batch_get_builds every few seconds
+        self.event_queue_url = os.environ.get('CODEBUILD_EVENT_QUEUE_URL')
+        self.sqs_client = boto3.client('sqs', config=CLIENT_CONFIG) if self.event_queue_url else None
+
     def start_build(self, project_name: str, source_version: str = None, 
                    environment_variables: Dict[str, str] = None) -> Dict[str, Any]:
         """
@@ -37,24 +104,16 @@ class CodeBuildTool:
             Build start result
         """
         try:
-            # Prepare build parameters
+            # Build the parameters in one construction pass
             build_params = {
-                'projectName': project_name
-            }
-            
-            if source_version:
-                build_params['sourceVersion'] = source_version
-            
-            if environment_variables:
-                build_params['environmentVariablesOverride'] = [
-                    {
-                        'name': key,
-                        'value': value,
-                        'type': 'PLAINTEXT'
-                    }
+                'projectName': project_name,
+                **({'sourceVersion': source_version} if source_version else {}),
+                **({'environmentVariablesOverride': [
+                    {'name': key, 'value': value, 'type': _PT}
                     for key, value in environment_variables.items()
-                ]
-            
+                ]} if environment_variables else {})
+            }
+
             # Start the build
             response = self.client.start_build(**build_params)
             
@@ -69,72 +128,127 @@ class CodeBuildTool:
                 'start_time': response['build']['startTime'].isoformat()
             }
             
-        except Exception as e:
-            logger.error(f"Error starting CodeBuild build: {e}")
+        except (ClientError, BotoCoreError) as e:
+            logger.exception("Error starting CodeBuild build")
             return {
                 'success': False,
                 'error': f'Failed to start build: {str(e)}'
             }
     
-    def get_build_status(self, build_id: str) -> Dict[str, Any]:
+    def _describe(self, build_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the raw build record for a build ID.
+
+        Args:
+            build_id: CodeBuild build ID
+
+        Returns:
+            The raw build dict from batch_get_builds, or None if the
+            build does not exist
+        """
+        response = self.client.batch_get_builds(ids=[build_id])
+        builds = response.get('builds')
+        return builds[0] if builds else None
+
+    def get_build_status(self, build_id: str,
+                        fields: tuple = ('status', 'phase', 'duration',
+                                         'start_time', 'end_time')) -> Dict[str, Any]:
         """
         Get the status of a CodeBuild build.
-        
+
         Args:
             build_id: CodeBuild build ID
-            
+            fields: Result fields to include; the heavy sub-dicts
+                ('logs', 'artifacts', 'environment', 'source') are only
+                copied into the result when named here
+
         Returns:
             Build status information
         """
-        try:
-            response = self.client.batch_get_builds(ids=[build_id])
-            
-            if not response['builds']:
+        cache_key = (build_id, fields)
+        cached = _status_cache.get(cache_key)
+        if cached and (cached[0] is None or cached[0] > time.monotonic()):
+            return cached[1]
+
+        with _status_guard:
+            lock = _status_locks.setdefault(build_id, threading.Lock())
+
+        with lock:
+            # Whoever held the lock first has refreshed the cache
+            cached = _status_cache.get(cache_key)
+            if cached and (cached[0] is None or cached[0] > time.monotonic()):
+                return cached[1]
+
+            try:
+                build = self._describe(build_id)
+
+                if not build:
+                    return {
+                        'success': False,
+                        'error': f'Build {build_id} not found'
+                    }
+
+                result = {
+                    'success': True,
+                    'build_id': build_id,
+                    'status': build['buildStatus'],
+                    'phase': build.get('currentPhase', 'UNKNOWN')
+                }
+                # ISO strings at construction so callers serialize the
+                # result without a default= handler
+                if 'start_time' in fields:
+                    result['start_time'] = build['startTime'].isoformat() if build.get('startTime') else None
+                if 'end_time' in fields:
+                    result['end_time'] = build['endTime'].isoformat() if build.get('endTime') else None
+                if 'duration' in fields:
+                    result['duration'] = self._calculate_duration(build.get('startTime'), build.get('endTime'))
+                for heavy in ('logs', 'artifacts', 'environment', 'source'):
+                    if heavy in fields:
+                        result[heavy] = build.get(heavy, {})
+
+                if len(_status_cache) >= _STATUS_CACHE_MAX:
+                    _status_cache.pop(next(iter(_status_cache)))
+
+                if result['status'] in self.TERMINAL_STATUSES:
+                    # Terminal answers never change; cache them for good
+                    # and drop the now-unneeded lock
+                    _status_cache[cache_key] = (None, result)
+                    with _status_guard:
+                        _status_locks.pop(build_id, None)
+                else:
+                    _status_cache[cache_key] = (time.monotonic() + _STATUS_CACHE_TTL, result)
+
+                return result
+
+            except (ClientError, BotoCoreError) as e:
+                logger.exception("Error getting build status")
                 return {
                     'success': False,
-                    'error': f'Build {build_id} not found'
+                    'error': f'Failed to get build status: {str(e)}'
                 }
-            
-            build = response['builds'][0]
-            
-            return {
-                'success': True,
-                'build_id': build_id,
-                'status': build['buildStatus'],
-                'phase': build.get('currentPhase', 'UNKNOWN'),
-                'start_time': build.get('startTime'),
-                'end_time': build.get('endTime'),
-                'duration': self._calculate_duration(build.get('startTime'), build.get('endTime')),
-                'logs': build.get('logs', {}),
-                'artifacts': build.get('artifacts', {}),
-                'environment': build.get('environment', {}),
-                'source': build.get('source', {})
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting build status: {e}")
-            return {
-                'success': False,
-                'error': f'Failed to get build status: {str(e)}'
-            }
     
-    def get_build_logs(self, build_id: str) -> Dict[str, Any]:
+    def get_build_logs(self, build_id: str, max_events: int = 50000) -> Dict[str, Any]:
         """
         Get the logs for a CodeBuild build.
-        
+
         Args:
             build_id: CodeBuild build ID
-            
+            max_events: Cap on collected events to bound memory
+
         Returns:
             Build logs
         """
         try:
-            # Get build details first
-            build_status = self.get_build_status(build_id)
-            if not build_status.get('success'):
-                return build_status
-            
-            logs_info = build_status.get('logs', {})
+            # One direct describe instead of the full get_build_status
+            # formatting pass — only the logs pointers are needed here
+            build = self._describe(build_id)
+            if not build:
+                return {
+                    'success': False,
+                    'error': f'Build {build_id} not found'
+                }
+
+            logs_info = build.get('logs', {})
             log_group = logs_info.get('groupName')
             log_stream = logs_info.get('streamName')
             
@@ -144,60 +258,145 @@ class CodeBuildTool:
                     'error': 'No logs available for this build'
                 }
             
-            # Get logs from CloudWatch
-            response = self.logs_client.get_log_events(
+            # Page through the whole stream instead of returning only
+            # the first get_log_events batch
+            paginator = self.logs_client.get_paginator('filter_log_events')
+            pages = paginator.paginate(
                 logGroupName=log_group,
-                logStreamName=log_stream,
-                startFromHead=True
+                logStreamNames=[log_stream],
+                PaginationConfig={'PageSize': 10000}
             )
-            
-            # Format log events
+
             log_events = []
-            for event in response.get('events', []):
-                log_events.append({
-                    'timestamp': event['timestamp'],
-                    'message': event['message'],
-                    'ingestion_time': event.get('ingestionTime')
-                })
-            
+            truncated = False
+            for page in pages:
+                log_events.extend(
+                    {
+                        'timestamp': event['timestamp'],
+                        'message': event['message'],
+                        'ingestion_time': event.get('ingestionTime')
+                    }
+                    for event in page.get('events', ())
+                )
+                if len(log_events) >= max_events:
+                    truncated = True
+                    break
+
             return {
                 'success': True,
                 'build_id': build_id,
                 'log_group': log_group,
                 'log_stream': log_stream,
                 'events': log_events,
-                'next_token': response.get('nextToken')
+                'truncated': truncated
             }
             
-        except Exception as e:
-            logger.error(f"Error getting build logs: {e}")
+        except (ClientError, BotoCoreError) as e:
+            logger.exception("Error getting build logs")
             return {
                 'success': False,
                 'error': f'Failed to get build logs: {str(e)}'
             }
     
+    def _wait_via_events(self, build_id: str, timeout_minutes: int) -> Dict[str, Any]:
+        """
+        Wait for build completion by consuming EventBridge notifications.
+
+        Long-polls the configured SQS queue for CodeBuild "Build State
+        Change" events instead of hitting batch_get_builds on a timer,
+        trading ~O(duration/poll_interval) API calls per build for one
+        final status fetch.
+
+        Args:
+            build_id: CodeBuild build ID
+            timeout_minutes: Maximum time to wait in minutes
+
+        Returns:
+            Final build result
+        """
+        deadline = time.monotonic() + timeout_minutes * 60
+
+        logger.info(f"Waiting for build {build_id} completion events (timeout: {timeout_minutes} minutes)")
+
+        while True:
+            if time.monotonic() > deadline:
+                return {
+                    'success': False,
+                    'error': f'Build timeout after {timeout_minutes} minutes',
+                    'build_id': build_id,
+                    'status': 'TIMEOUT'
+                }
+
+            response = self.sqs_client.receive_message(
+                QueueUrl=self.event_queue_url,
+                MaxNumberOfMessages=10,
+                WaitTimeSeconds=20
+            )
+
+            for message in response.get('Messages', []):
+                try:
+                    detail = json.loads(message.get('Body', '{}')).get('detail', {})
+                except ValueError:
+                    detail = {}
+
+                # Events carry the full build ARN; ours ends with build_id
+                event_build = detail.get('build-id', '')
+                if not event_build.endswith(build_id):
+                    # Leave foreign messages for their own waiters
+                    continue
+
+                self.sqs_client.delete_message(
+                    QueueUrl=self.event_queue_url,
+                    ReceiptHandle=message['ReceiptHandle']
+                )
+
+                status = detail.get('build-status')
+                logger.info(f"Build {build_id} event status: {status}")
+
+                if status in self.TERMINAL_STATUSES:
+                    # One final fetch for phase/duration details
+                    status_result = self.get_build_status(build_id)
+                    return {
+                        'success': status == 'SUCCEEDED',
+                        'build_id': build_id,
+                        'status': status,
+                        'phase': status_result.get('phase', 'COMPLETED'),
+                        'duration': status_result.get('duration'),
+                        'start_time': status_result.get('start_time'),
+                        'end_time': status_result.get('end_time')
+                    }
+
     def wait_for_build_completion(self, build_id: str, timeout_minutes: int = 30) -> Dict[str, Any]:
         """
         Wait for a CodeBuild build to complete.
-        
+
+        Uses push notifications when CODEBUILD_EVENT_QUEUE_URL is
+        configured, otherwise falls back to status polling.
+
         Args:
             build_id: CodeBuild build ID
             timeout_minutes: Maximum time to wait in minutes
-            
+
         Returns:
             Final build result
         """
-        import time
-        
-        start_time = datetime.now(timezone.utc)
-        timeout_seconds = timeout_minutes * 60
-        
+        if self.event_queue_url:
+            return self._wait_via_events(build_id, timeout_minutes)
+
+        # Monotonic deadline: immune to NTP adjustments and cheaper
+        # than constructing a datetime per iteration
+        deadline = time.monotonic() + timeout_minutes * 60
+
+        # Exponential back-off with a cap: short builds are noticed
+        # within seconds while long builds stop hammering the API
+        delay = 2.0
+        last_phase = None
+
         logger.info(f"Waiting for build {build_id} to complete (timeout: {timeout_minutes} minutes)")
-        
+
         while True:
             # Check timeout
-            elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
-            if elapsed > timeout_seconds:
+            if time.monotonic() > deadline:
                 return {
                     'success': False,
                     'error': f'Build timeout after {timeout_minutes} minutes',
@@ -216,7 +415,7 @@ class CodeBuildTool:
             logger.info(f"Build {build_id} status: {status} (phase: {phase})")
             
             # Check if build is complete
-            if status in ['SUCCEEDED', 'FAILED', 'STOPPED', 'TIMED_OUT']:
+            if status in self.TERMINAL_STATUSES:
                 return {
                     'success': status == 'SUCCEEDED',
                     'build_id': build_id,
@@ -227,10 +426,152 @@ class CodeBuildTool:
                     'end_time': status_result.get('end_time')
                 }
             
+            # A phase transition means the build is progressing, so poll
+            # eagerly again; only stalled phases back off toward the cap
+            if phase != last_phase:
+                delay = 2.0
+                last_phase = phase
+
             # Wait before checking again
-            time.sleep(10)
+            time.sleep(delay)
+            delay = min(delay * 1.5, 30) + random.uniform(0, delay * 0.1)
     
-    def run_tests(self, project_name: str, repo_name: str, branch_name: str, 
+    def _live_tail_logs(self, log_group: str, log_stream: str,
+                       stop_event: threading.Event) -> List[Dict[str, Any]]:
+        """
+        Stream log events over a single start_live_tail connection.
+
+        One persistent streaming session replaces repeated get_log_events
+        polls, so tailing a long build costs one API call instead of one
+        per poll interval. Raises when live tail is unavailable so the
+        caller can fall back to polling.
+
+        Args:
+            log_group: CloudWatch log group name
+            log_stream: CloudWatch log stream name
+            stop_event: Set by the caller when the build has completed
+
+        Returns:
+            List of collected log events
+        """
+        # start_live_tail addresses log groups by ARN
+        groups = self.logs_client.describe_log_groups(
+            logGroupNamePrefix=log_group
+        ).get('logGroups', [])
+        arns = [
+            group['arn'].rstrip(':*')
+            for group in groups
+            if group.get('logGroupName') == log_group and group.get('arn')
+        ]
+        if not arns:
+            raise ValueError(f'Log group not found: {log_group}')
+
+        events: List[Dict[str, Any]] = []
+        response = self.logs_client.start_live_tail(
+            logGroupIdentifiers=arns[:1],
+            logStreamNames=[log_stream]
+        )
+
+        for page in response['responseStream']:
+            update = page.get('sessionUpdate')
+            if update:
+                events.extend(
+                    {
+                        'timestamp': result.get('timestamp'),
+                        'message': result.get('message'),
+                        'ingestion_time': result.get('ingestionTime')
+                    }
+                    for result in update.get('sessionResults', ())
+                )
+
+            # Heartbeat pages keep this check live even when quiet
+            if stop_event.is_set():
+                break
+
+        return events
+
+    def _tail_build_logs(self, build_id: str, stop_event: threading.Event,
+                        poll_interval: float = 5.0) -> List[Dict[str, Any]]:
+        """
+        Incrementally collect CloudWatch log events while a build runs.
+
+        Each poll passes the forward token from the previous poll, so only
+        new events transfer; one final drain after the build completes
+        picks up the tail of the stream.
+
+        Args:
+            build_id: CodeBuild build ID
+            stop_event: Set by the caller when the build has completed
+            poll_interval: Seconds between polls while the build runs
+
+        Returns:
+            List of collected log events
+        """
+        events: List[Dict[str, Any]] = []
+        next_token = None
+        log_group = None
+        log_stream = None
+        live_tail_attempted = False
+
+        while True:
+            finished = stop_event.is_set()
+
+            # The log stream only exists once the build has started
+            if not log_group or not log_stream:
+                status = self.get_build_status(build_id, fields=('logs',))
+                logs_info = status.get('logs', {}) if status.get('success') else {}
+                log_group = logs_info.get('groupName')
+                log_stream = logs_info.get('streamName')
+
+            # Prefer one streaming session over repeated polls; fall back
+            # to get_log_events where live tail is unavailable
+            if log_group and log_stream and not live_tail_attempted and not finished:
+                live_tail_attempted = True
+                try:
+                    return self._live_tail_logs(log_group, log_stream, stop_event)
+                except (ClientError, BotoCoreError, ValueError) as e:
+                    logger.info("Live tail unavailable, polling instead: %s", e)
+
+            if log_group and log_stream:
+                try:
+                    poll_kwargs = {
+                        'logGroupName': log_group,
+                        'logStreamName': log_stream,
+                        'startFromHead': True
+                    }
+                    if next_token:
+                        poll_kwargs['nextToken'] = next_token
+
+                    response = self.logs_client.get_log_events(**poll_kwargs)
+
+                    events.extend(
+                        {
+                            'timestamp': event['timestamp'],
+                            'message': event['message'],
+                            'ingestion_time': event.get('ingestionTime')
+                        }
+                        for event in response.get('events', ())
+                    )
+
+                    token = response.get('nextForwardToken')
+                    if finished and token == next_token:
+                        # Stream fully drained after completion
+                        break
+                    next_token = token
+
+                except (ClientError, BotoCoreError) as e:
+                    logger.warning("Log tailing failed for build %s: %s", build_id, e)
+                    if finished:
+                        break
+            elif finished:
+                break
+
+            if not finished:
+                stop_event.wait(poll_interval)
+
+        return events
+
+    def run_tests(self, project_name: str, repo_name: str, branch_name: str,
                  commit_sha: str = None) -> Dict[str, Any]:
         """
         Run tests for a specific repository and branch.
@@ -267,29 +608,81 @@ class CodeBuildTool:
             
             build_id = start_result['build_id']
             logger.info(f"Started test build {build_id} for {repo_name}#{branch_name}")
-            
-            # Wait for completion
-            completion_result = self.wait_for_build_completion(build_id)
-            
-            # Get logs for detailed results
-            logs_result = self.get_build_logs(build_id)
-            
+
+            # Tail logs on a worker thread while waiting for completion,
+            # so the post-build log fetch only pays for the final tail
+            # instead of re-downloading the whole stream
+            stop_event = threading.Event()
+            log_future = _background_executor.submit(self._tail_build_logs, build_id, stop_event)
+
+            try:
+                completion_result = self.wait_for_build_completion(build_id)
+            finally:
+                stop_event.set()
+
+            # The tailer ran alongside the wait, so this join only pays
+            # for the final drain; bound it so a wedged log stream
+            # cannot hang an otherwise-finished run
+            logs_error = None
+            try:
+                log_events = log_future.result(timeout=60)
+            except concurrent.futures.TimeoutError:
+                logger.warning(f"Log tail for build {build_id} did not finish; returning without logs")
+                log_events = []
+                logs_error = 'Log collection timed out'
+
             return {
                 'success': completion_result.get('success', False),
                 'build_id': build_id,
                 'status': completion_result.get('status'),
                 'duration': completion_result.get('duration'),
-                'logs': logs_result.get('events', []) if logs_result.get('success') else [],
-                'logs_error': logs_result.get('error') if not logs_result.get('success') else None
+                'logs': log_events,
+                'logs_error': logs_error
             }
             
-        except Exception as e:
-            logger.error(f"Error running tests: {e}")
+        except (ClientError, BotoCoreError) as e:
+            logger.exception("Error running tests")
             return {
                 'success': False,
                 'error': f'Test execution failed: {str(e)}'
             }
     
+    def run_tests_batch(self, project_name: str, targets: List[Dict[str, str]],
+                       max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Run tests for several repository/branch targets concurrently.
+
+        The per-target work is pure network I/O (CodeBuild and CloudWatch
+        round-trips), so fanning the targets out over a thread pool makes
+        the batch take roughly as long as its slowest build instead of
+        the sum of all builds.
+
+        Args:
+            project_name: CodeBuild project name
+            targets: List of dicts with 'repo_name', 'branch_name' and
+                optional 'commit_sha'
+            max_workers: Maximum number of concurrent builds
+
+        Returns:
+            List of test execution results, in target order
+        """
+        if not targets:
+            return []
+
+        workers = min(len(targets), max_workers)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    self.run_tests,
+                    project_name,
+                    target['repo_name'],
+                    target['branch_name'],
+                    target.get('commit_sha')
+                )
+                for target in targets
+            ]
+            return [future.result() for future in futures]
+
     def get_build_artifacts(self, build_id: str) -> Dict[str, Any]:
         """
         Get artifacts from a completed build.
@@ -301,12 +694,15 @@ class CodeBuildTool:
             Build artifacts information
         """
         try:
-            build_status = self.get_build_status(build_id)
-            if not build_status.get('success'):
-                return build_status
-            
-            artifacts = build_status.get('artifacts', {})
-            
+            build = self._describe(build_id)
+            if not build:
+                return {
+                    'success': False,
+                    'error': f'Build {build_id} not found'
+                }
+
+            artifacts = build.get('artifacts', {})
+
             return {
                 'success': True,
                 'build_id': build_id,
@@ -315,94 +711,121 @@ class CodeBuildTool:
                 'artifact_identifier': artifacts.get('artifactIdentifier')
             }
             
-        except Exception as e:
-            logger.error(f"Error getting build artifacts: {e}")
+        except (ClientError, BotoCoreError) as e:
+            logger.exception("Error getting build artifacts")
             return {
                 'success': False,
                 'error': f'Failed to get artifacts: {str(e)}'
             }
     
-    def _calculate_duration(self, start_time, end_time) -> Optional[str]:
+    def _calculate_duration(self, start_time, end_time, want_string: bool = True):
         """
         Calculate build duration.
-        
+
         Args:
             start_time: Build start time
             end_time: Build end time
-            
+            want_string: Return a formatted string; pass False to get
+                raw integer seconds and skip formatting entirely
+
         Returns:
-            Duration string or None
+            Duration string (or int seconds) or None
         """
         if not start_time or not end_time:
             return None
-        
+
         try:
+            # boto3 already hands back datetimes; string parsing only
+            # happens for pre-formatted inputs
             if isinstance(start_time, str):
                 start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
             if isinstance(end_time, str):
                 end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-            
-            duration = end_time - start_time
-            total_seconds = int(duration.total_seconds())
-            
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-            
-            if hours > 0:
-                return f"{hours}h {minutes}m {seconds}s"
-            elif minutes > 0:
-                return f"{minutes}m {seconds}s"
-            else:
-                return f"{seconds}s"
-                
-        except Exception as e:
-            logger.warning(f"Error calculating duration: {e}")
+
+            total_seconds = int(end_time.timestamp() - start_time.timestamp())
+            if not want_string:
+                return total_seconds
+
+            hours, remainder = divmod(total_seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            return (f"{hours}h {minutes}m {seconds}s" if hours
+                    else f"{minutes}m {seconds}s" if minutes
+                    else f"{seconds}s")
+
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.warning("Error calculating duration: %s", e)
             return None
     
-    def list_builds(self, project_name: str = None, limit: int = 10) -> Dict[str, Any]:
+    def list_builds(self, project_name: str = None, limit: int = 10,
+                   duration_strings: bool = False) -> Dict[str, Any]:
         """
         List recent builds for a project.
-        
+
         Args:
             project_name: CodeBuild project name (optional)
             limit: Maximum number of builds to return
-            
+            duration_strings: Format durations as strings instead of
+                raw seconds
+
         Returns:
             List of builds
         """
         try:
-            list_params = {
-                'sortOrder': 'DESCENDING'
-            }
-            
-            response = self.client.list_builds(**list_params)
-            
-            # Get detailed information for each build
-            build_ids = response.get('ids', [])[:limit]
+            # Page through build IDs until the requested limit is reached;
+            # a single list_builds response caps out at 100 IDs
+            build_ids = []
+            next_token = None
+
+            while len(build_ids) < limit:
+                list_params = {'sortOrder': 'DESCENDING'}
+                if next_token:
+                    list_params['nextToken'] = next_token
+
+                response = self.client.list_builds(**list_params)
+                build_ids.extend(response.get('ids', []))
+
+                next_token = response.get('nextToken')
+                if not next_token:
+                    break
+
+            build_ids = build_ids[:limit]
             if not build_ids:
                 return {
                     'success': True,
                     'builds': [],
                     'count': 0
                 }
-            
-            builds_result = self.client.batch_get_builds(ids=build_ids)
-            builds = builds_result.get('builds', [])
+
+            # batch_get_builds accepts at most 100 IDs per call; fetch the
+            # chunks concurrently so detail retrieval costs one round-trip
+            chunks = [build_ids[i:i + 100] for i in range(0, len(build_ids), 100)]
+
+            if len(chunks) == 1:
+                builds = self.client.batch_get_builds(ids=chunks[0]).get('builds', [])
+            else:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as executor:
+                    chunk_results = executor.map(
+                        lambda chunk: self.client.batch_get_builds(ids=chunk),
+                        chunks
+                    )
+                builds = [build for result in chunk_results for build in result.get('builds', [])]
             
             # Format build information
             formatted_builds = []
             for build in builds:
-                formatted_builds.append({
-                    'id': build['id'],
-                    'status': build['buildStatus'],
-                    'phase': build.get('currentPhase', 'UNKNOWN'),
-                    'start_time': build.get('startTime'),
-                    'end_time': build.get('endTime'),
-                    'duration': self._calculate_duration(build.get('startTime'), build.get('endTime')),
-                    'project_name': build.get('projectName'),
-                    'source_version': build.get('sourceVersion')
-                })
+                formatted_builds.append(BuildSummary(
+                    id=build['id'],
+                    status=build['buildStatus'],
+                    phase=build.get('currentPhase', 'UNKNOWN'),
+                    start_time=build['startTime'].isoformat() if build.get('startTime') else None,
+                    end_time=build['endTime'].isoformat() if build.get('endTime') else None,
+                    duration=self._calculate_duration(
+                        build.get('startTime'), build.get('endTime'),
+                        want_string=duration_strings
+                    ),
+                    project_name=build.get('projectName'),
+                    source_version=build.get('sourceVersion')
+                ))
             
             return {
                 'success': True,
@@ -410,8 +833,8 @@ class CodeBuildTool:
                 'count': len(formatted_builds)
             }
             
-        except Exception as e:
-            logger.error(f"Error listing builds: {e}")
+        except (ClientError, BotoCoreError) as e:
+            logger.exception("Error listing builds")
             return {
                 'success': False,
                 'error': f'Failed to list builds: {str(e)}'
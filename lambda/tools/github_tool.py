@@ -5,16 +5,54 @@ This module provides GitHub API integration for the autonomous agent,
 including branch creation, patch application, and pull request management.
 """
 
+import base64
+import concurrent.futures
 import os
 import json
 import logging
+import re
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
 from typing import Dict, Any, Optional
-from datetime import datetime
+from urllib.parse import urlencode
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Fast JSON codec: orjson (C-implemented) when available, stdlib otherwise
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+# Bound the codec lookups once; these run per file on large patches
+_b64encode = base64.b64encode
+_b64decode = base64.b64decode
+
+# Bounded size for the per-instance ETag cache
+_ETAG_CACHE_MAX = 256
+
+# Head SHAs are only reused within a single commit sequence
+_BRANCH_SHA_TTL = 5.0
+
+# Repository metadata changes rarely; fresh enough for burst processing
+_REPO_INFO_TTL = 60.0
+
+# Precompiled unified-diff markers: file headers split the patch into
+# per-file segments, then kept lines ('+' additions and ' ' context)
+# are collected in one C-level scan per segment
+_PATCH_FILE_RE = re.compile(r'^--- a/(.*)$', re.M)
+_PATCH_DEST_RE = re.compile(r'^\+\+\+ b/(.*)$', re.M)
+_PATCH_KEEP_RE = re.compile(r'^[ +](.*)$', re.M)
+
 class GitHubTool:
     """GitHub API integration tool for autonomous agent operations."""
     
@@ -25,13 +63,48 @@ class GitHubTool:
         self.headers = {
             'Authorization': f'token {self.token}',
             'Accept': 'application/vnd.github.v3+json',
+            # urllib3 decompresses transparently; advertising gzip cuts
+            # transfer size several-fold on large JSON and file bodies
+            'Accept-Encoding': 'gzip, deflate',
             'User-Agent': 'AutoTriage-AutoFix-Agent/1.0'
         }
         
         if not self.token:
             logger.error("GITHUB_TOKEN not configured")
             raise ValueError("GitHub token is required")
-    
+
+        # One pooled session keeps keep-alive sockets to api.github.com,
+        # so multi-call flows like apply_patch skip the TLS handshake on
+        # every request after the first
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
+        # ETag store for conditional GETs: a 304 revalidation returns
+        # the cached body and does not count against the rate limit
+        self._etag_cache: OrderedDict = OrderedDict()
+
+        # Default branches are effectively static within a warm
+        # container; head SHAs get a short TTL so one commit sequence
+        # shares a single ref lookup
+        self._default_branch_cache: Dict[str, str] = {}
+        self._branch_sha_cache: Dict[tuple, tuple] = {}
+        self._repo_info_cache: Dict[str, tuple] = {}
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(['GET', 'PUT', 'POST', 'DELETE'])
+            )
+        ))
+
+    def close(self):
+        """Release the pooled HTTP connections."""
+        self.session.close()
+
+
     def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """
         Make authenticated GitHub API request.
@@ -44,40 +117,77 @@ class GitHubTool:
         Returns:
             API response as dictionary
         """
+        is_get = method == 'GET'
+        cache_key = None
+        cached = None
+        if is_get:
+            params = kwargs.get('params') or {}
+            cache_key = url + '?' + urlencode(sorted(params.items()))
+            cached = self._etag_cache.get(cache_key)
+            if cached:
+                kwargs['headers'] = {
+                    **(kwargs.get('headers') or {}),
+                    'If-None-Match': cached[0]
+                }
+
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
-                headers=self.headers,
                 timeout=30,
                 **kwargs
             )
-            
-            # Handle rate limiting
-            if response.status_code == 403 and 'rate limit' in response.text.lower():
+
+            # Unchanged since last fetch: serve the cached body
+            if cached and response.status_code == 304:
+                return {
+                    'success': True,
+                    'data': cached[1],
+                    'status_code': 304,
+                    'from_cache': True
+                }
+
+            # Handle rate limiting via headers, keeping the body
+            # undecoded on this path
+            if (response.status_code in (403, 429)
+                    and response.headers.get('X-RateLimit-Remaining') == '0'):
                 logger.warning("GitHub API rate limit exceeded")
                 return {
                     'success': False,
                     'error': 'GitHub API rate limit exceeded',
-                    'retry_after': response.headers.get('X-RateLimit-Reset', 0)
+                    'retry_after': (response.headers.get('Retry-After')
+                                    or response.headers.get('X-RateLimit-Reset', 0))
                 }
-            
+
             # Handle other errors
             if response.status_code >= 400:
-                logger.error(f"GitHub API error {response.status_code}: {response.text}")
+                error_body = response.text[:512]
+                logger.error("GitHub API error %s: %s", response.status_code, error_body)
                 return {
                     'success': False,
-                    'error': f'GitHub API error: {response.status_code} - {response.text}'
+                    'error': f'GitHub API error: {response.status_code} - {error_body}'
                 }
             
+            # Parse the raw bytes directly, skipping requests' own json
+            # dispatch and one UTF-8 decode
+            data = _loads(response.content) if response.content else {}
+
+            if is_get:
+                etag = response.headers.get('ETag')
+                if etag:
+                    self._etag_cache[cache_key] = (etag, data)
+                    self._etag_cache.move_to_end(cache_key)
+                    if len(self._etag_cache) > _ETAG_CACHE_MAX:
+                        self._etag_cache.popitem(last=False)
+
             return {
                 'success': True,
-                'data': response.json() if response.content else {},
+                'data': data,
                 'status_code': response.status_code
             }
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"GitHub API request failed: {e}")
+            logger.error("GitHub API request failed: %s", e)
             return {
                 'success': False,
                 'error': f'Request failed: {str(e)}'
@@ -93,8 +203,20 @@ class GitHubTool:
         Returns:
             Repository information
         """
+        now = time.monotonic()
+        hit = self._repo_info_cache.get(repo_name)
+        if hit and now - hit[0] < _REPO_INFO_TTL:
+            return hit[1]
+
         url = f"{self.api_base}/repos/{repo_name}"
-        return self._make_request('GET', url)
+        result = self._make_request('GET', url)
+
+        if result.get('success'):
+            self._repo_info_cache[repo_name] = (now, result)
+        else:
+            # Don't keep serving stale data past an error
+            self._repo_info_cache.pop(repo_name, None)
+        return result
     
     def get_default_branch(self, repo_name: str) -> Optional[str]:
         """
@@ -106,9 +228,15 @@ class GitHubTool:
         Returns:
             Default branch name or None
         """
+        cached = self._default_branch_cache.get(repo_name)
+        if cached:
+            return cached
+
         result = self.get_repository_info(repo_name)
         if result.get('success'):
-            return result['data'].get('default_branch', 'main')
+            branch = result['data'].get('default_branch', 'main')
+            self._default_branch_cache[repo_name] = branch
+            return branch
         return None
     
     def get_branch_sha(self, repo_name: str, branch: str) -> Optional[str]:
@@ -122,11 +250,20 @@ class GitHubTool:
         Returns:
             Branch SHA or None
         """
+        cache_key = (repo_name, branch)
+        hit = self._branch_sha_cache.get(cache_key)
+        now = time.monotonic()
+        if hit and now - hit[0] < _BRANCH_SHA_TTL:
+            return hit[1]
+
         url = f"{self.api_base}/repos/{repo_name}/git/refs/heads/{branch}"
         result = self._make_request('GET', url)
-        
+
         if result.get('success'):
-            return result['data'].get('object', {}).get('sha')
+            sha = result['data'].get('object', {}).get('sha')
+            if sha:
+                self._branch_sha_cache[cache_key] = (now, sha)
+            return sha
         return None
     
     def create_branch(self, repo_name: str, branch_name: str, base_branch: str = None) -> Dict[str, Any]:
@@ -169,49 +306,83 @@ class GitHubTool:
             result = self._make_request('POST', url, json=data)
             
             if result.get('success'):
-                logger.info(f"Created branch {branch_name} from {base_branch}")
+                logger.info("Created branch %s from %s", branch_name, base_branch)
+                sha = result['data'].get('object', {}).get('sha')
+                # Seed the new ref so the follow-up patch apply skips
+                # its own lookup
+                self._branch_sha_cache[(repo_name, branch_name)] = (time.monotonic(), sha)
                 return {
                     'success': True,
                     'branch_name': branch_name,
-                    'sha': result['data'].get('object', {}).get('sha')
+                    'sha': sha
                 }
             else:
                 return result
                 
         except Exception as e:
-            logger.error(f"Error creating branch: {e}")
+            logger.error("Error creating branch: %s", e)
             return {
                 'success': False,
                 'error': f'Branch creation failed: {str(e)}'
             }
     
-    def get_file_content(self, repo_name: str, file_path: str, branch: str = None) -> Dict[str, Any]:
+    def get_file_content(self, repo_name: str, file_path: str, branch: str = None,
+                        raw: bool = False) -> Dict[str, Any]:
         """
         Get the content of a file from the repository.
-        
+
         Args:
             repo_name: Repository name in format 'owner/repo'
             file_path: Path to the file
             branch: Branch to read from (defaults to default branch)
-            
+            raw: Fetch the body via the raw media type, skipping the
+                base64 round-trip; the result carries no blob SHA
+
         Returns:
             File content result
         """
         if not branch:
             branch = self.get_default_branch(repo_name)
-        
+
         url = f"{self.api_base}/repos/{repo_name}/contents/{file_path}"
         params = {'ref': branch} if branch else {}
-        
+
+        if raw:
+            # The raw media type returns the file body directly: no
+            # server-side base64 encode, no JSON wrapper to parse
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    headers={'Accept': 'application/vnd.github.raw'},
+                    timeout=30
+                )
+                if response.status_code >= 400:
+                    return {
+                        'success': False,
+                        'error': f'GitHub API error: {response.status_code} - {response.text[:512]}'
+                    }
+                return {
+                    'success': True,
+                    'content': response.text,
+                    'sha': response.headers.get('ETag', '').strip('W/"'),
+                    'size': len(response.content)
+                }
+            except requests.exceptions.RequestException as e:
+                logger.error("GitHub API request failed: %s", e)
+                return {
+                    'success': False,
+                    'error': f'Request failed: {str(e)}'
+                }
+
         result = self._make_request('GET', url, params=params)
         
         if result.get('success'):
             # Decode base64 content
-            import base64
             content = result['data'].get('content', '')
             if content:
                 try:
-                    decoded_content = base64.b64decode(content).decode('utf-8')
+                    decoded_content = _b64decode(content).decode('utf-8')
                     return {
                         'success': True,
                         'content': decoded_content,
@@ -254,9 +425,8 @@ class GitHubTool:
                 sha = file_info.get('sha')
             
             # Encode content
-            import base64
-            encoded_content = base64.b64encode(content.encode('utf-8')).decode('utf-8')
-            
+            encoded_content = _b64encode(content.encode('utf-8')).decode('ascii')
+
             # Update file
             url = f"{self.api_base}/repos/{repo_name}/contents/{file_path}"
             data = {
@@ -269,7 +439,7 @@ class GitHubTool:
             result = self._make_request('PUT', url, json=data)
             
             if result.get('success'):
-                logger.info(f"Updated file {file_path} in branch {branch}")
+                logger.info("Updated file %s in branch %s", file_path, branch)
                 return {
                     'success': True,
                     'commit_sha': result['data'].get('commit', {}).get('sha'),
@@ -279,7 +449,7 @@ class GitHubTool:
                 return result
                 
         except Exception as e:
-            logger.error(f"Error updating file: {e}")
+            logger.error("Error updating file: %s", e)
             return {
                 'success': False,
                 'error': f'File update failed: {str(e)}'
@@ -302,9 +472,8 @@ class GitHubTool:
         """
         try:
             # Encode content
-            import base64
-            encoded_content = base64.b64encode(content.encode('utf-8')).decode('utf-8')
-            
+            encoded_content = _b64encode(content.encode('utf-8')).decode('ascii')
+
             # Create file
             url = f"{self.api_base}/repos/{repo_name}/contents/{file_path}"
             data = {
@@ -316,7 +485,7 @@ class GitHubTool:
             result = self._make_request('PUT', url, json=data)
             
             if result.get('success'):
-                logger.info(f"Created file {file_path} in branch {branch}")
+                logger.info("Created file %s in branch %s", file_path, branch)
                 return {
                     'success': True,
                     'commit_sha': result['data'].get('commit', {}).get('sha'),
@@ -326,7 +495,7 @@ class GitHubTool:
                 return result
                 
         except Exception as e:
-            logger.error(f"Error creating file: {e}")
+            logger.error("Error creating file: %s", e)
             return {
                 'success': False,
                 'error': f'File creation failed: {str(e)}'
@@ -356,32 +525,46 @@ class GitHubTool:
                     'error': 'No valid file changes found in patch'
                 }
             
-            results = []
-            for file_path, file_content in patch_files.items():
-                if file_content is None:
-                    # File deletion
-                    result = self._delete_file(repo_name, file_path, commit_message, branch)
-                else:
-                    # File creation or update
-                    file_info = self.get_file_content(repo_name, file_path, branch)
-                    if file_info.get('success'):
-                        # Update existing file
-                        result = self.update_file(
-                            repo_name, file_path, file_content, 
-                            commit_message, branch, file_info.get('sha')
-                        )
-                    else:
-                        # Create new file
-                        result = self.create_file(
-                            repo_name, file_path, file_content, 
-                            commit_message, branch
-                        )
-                
-                results.append({
-                    'file_path': file_path,
-                    'success': result.get('success', False),
-                    'error': result.get('error')
-                })
+            # Preferred path: one atomic commit through the Git Data API
+            # (~N+3 round-trips and a single commit instead of 2N calls
+            # and N commits through the Contents API)
+            commit_result = self._commit_tree(repo_name, branch, patch_files, commit_message)
+
+            if commit_result.get('success'):
+                return {
+                    'success': True,
+                    'files_processed': len(patch_files),
+                    'files_successful': len(patch_files),
+                    'commit_sha': commit_result.get('commit_sha'),
+                    'results': [
+                        {'file_path': file_path, 'success': True, 'error': None}
+                        for file_path in patch_files
+                    ]
+                }
+
+            logger.warning("Tree commit failed (%s), falling back to per-file updates", commit_result.get('error'))
+
+            # Per-file operations are independent, so fan them out over
+            # the pooled session; keep workers within the adapter's
+            # pool_maxsize so no request waits on a socket
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {
+                    file_path: executor.submit(
+                        self._apply_one_file,
+                        repo_name, file_path, file_content,
+                        commit_message, branch
+                    )
+                    for file_path, file_content in patch_files.items()
+                }
+
+                results = []
+                for file_path, future in futures.items():
+                    result = future.result()
+                    results.append({
+                        'file_path': file_path,
+                        'success': result.get('success', False),
+                        'error': result.get('error')
+                    })
             
             # Check if all operations succeeded
             success_count = sum(1 for r in results if r['success'])
@@ -395,12 +578,142 @@ class GitHubTool:
             }
             
         except Exception as e:
-            logger.error(f"Error applying patch: {e}")
+            logger.error("Error applying patch: %s", e)
             return {
                 'success': False,
                 'error': f'Patch application failed: {str(e)}'
             }
     
+    def _commit_tree(self, repo_name: str, branch: str, files: Dict[str, Optional[str]],
+                    message: str) -> Dict[str, Any]:
+        """
+        Commit a set of file changes as one atomic commit via the Git Data API.
+
+        Uploads one blob per changed file (concurrently), builds a single
+        tree on top of the branch head, creates one commit and advances
+        the ref.
+
+        Args:
+            repo_name: Repository name in format 'owner/repo'
+            branch: Branch to commit to
+            files: Mapping of file path to new content (None deletes)
+            message: Commit message
+
+        Returns:
+            Commit result with the new commit SHA
+        """
+        git_base = f"{self.api_base}/repos/{repo_name}/git"
+
+        parent_sha = self.get_branch_sha(repo_name, branch)
+        if not parent_sha:
+            return {
+                'success': False,
+                'error': f'Could not resolve head of branch {branch}'
+            }
+
+        parent_commit = self._make_request('GET', f"{git_base}/commits/{parent_sha}")
+        if not parent_commit.get('success'):
+            return parent_commit
+        base_tree = parent_commit['data'].get('tree', {}).get('sha')
+
+        def _create_blob(content: str) -> Dict[str, Any]:
+            encoded = _b64encode(content.encode('utf-8')).decode('ascii')
+            return self._make_request(
+                'POST', f"{git_base}/blobs",
+                json={'content': encoded, 'encoding': 'base64'}
+            )
+
+        # Blob uploads are independent; run them over the pooled session
+        to_upload = {path: content for path, content in files.items() if content is not None}
+        blob_shas = {}
+        if to_upload:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {
+                    path: executor.submit(_create_blob, content)
+                    for path, content in to_upload.items()
+                }
+                for path, future in futures.items():
+                    result = future.result()
+                    if not result.get('success'):
+                        return result
+                    blob_shas[path] = result['data'].get('sha')
+
+        # sha=None in a tree entry removes the path
+        tree_entries = [
+            {'path': path, 'mode': '100644', 'type': 'blob', 'sha': blob_shas.get(path)}
+            for path in files
+        ]
+
+        tree_result = self._make_request(
+            'POST', f"{git_base}/trees",
+            json={'base_tree': base_tree, 'tree': tree_entries}
+        )
+        if not tree_result.get('success'):
+            return tree_result
+
+        commit_result = self._make_request(
+            'POST', f"{git_base}/commits",
+            json={
+                'message': message,
+                'tree': tree_result['data'].get('sha'),
+                'parents': [parent_sha]
+            }
+        )
+        if not commit_result.get('success'):
+            return commit_result
+
+        commit_sha = commit_result['data'].get('sha')
+        ref_result = self._make_request(
+            'PATCH', f"{git_base}/refs/heads/{branch}",
+            json={'sha': commit_sha}
+        )
+        if not ref_result.get('success'):
+            return ref_result
+
+        # The ref moved; keep the SHA cache in step
+        self._branch_sha_cache[(repo_name, branch)] = (time.monotonic(), commit_sha)
+
+        logger.info("Committed %s file(s) to %s as %s", len(files), branch, commit_sha)
+        return {
+            'success': True,
+            'commit_sha': commit_sha,
+            'files_committed': len(files)
+        }
+
+    def _apply_one_file(self, repo_name: str, file_path: str, file_content: Optional[str],
+                       commit_message: str, branch: str) -> Dict[str, Any]:
+        """
+        Apply a single parsed patch entry.
+
+        Args:
+            repo_name: Repository name in format 'owner/repo'
+            file_path: Path of the file being changed
+            file_content: New content, or None for a deletion
+            commit_message: Commit message
+            branch: Branch to apply the change to
+
+        Returns:
+            Per-file operation result
+        """
+        if file_content is None:
+            # File deletion
+            return self._delete_file(repo_name, file_path, commit_message, branch)
+
+        # File creation or update
+        file_info = self.get_file_content(repo_name, file_path, branch)
+        if file_info.get('success'):
+            # Update existing file
+            return self.update_file(
+                repo_name, file_path, file_content,
+                commit_message, branch, file_info.get('sha')
+            )
+
+        # Create new file
+        return self.create_file(
+            repo_name, file_path, file_content,
+            commit_message, branch
+        )
+
     def _parse_patch(self, patch_content: str) -> Dict[str, str]:
         """
         Parse unified diff patch to extract file changes.
@@ -411,38 +724,30 @@ class GitHubTool:
         Returns:
             Dictionary mapping file paths to new content
         """
+        if not patch_content:
+            return {}
+
         files = {}
-        current_file = None
-        current_content = []
-        in_hunk = False
-        
-        for line in patch_content.split('\n'):
-            if line.startswith('--- a/'):
-                # Start of file section
-                current_file = line[6:]  # Remove '--- a/'
-                current_content = []
-                in_hunk = False
-            elif line.startswith('+++ b/'):
-                # File destination
-                if current_file:
-                    files[current_file] = None  # Will be updated with content
-                in_hunk = True
-            elif in_hunk and current_file:
-                if line.startswith('+') and not line.startswith('+++'):
-                    # Added line
-                    current_content.append(line[1:])
-                elif line.startswith(' ') or line.startswith('-'):
-                    # Context or removed line
-                    if line.startswith(' '):
-                        current_content.append(line[1:])
-                elif line.startswith('@@'):
-                    # Hunk header - continue
-                    continue
-                else:
-                    # End of hunk
-                    if current_content:
-                        files[current_file] = '\n'.join(current_content)
-        
+        file_marks = list(_PATCH_FILE_RE.finditer(patch_content))
+
+        for index, mark in enumerate(file_marks):
+            file_path = mark.group(1)
+            segment_end = (file_marks[index + 1].start()
+                           if index + 1 < len(file_marks)
+                           else len(patch_content))
+            segment = patch_content[mark.end():segment_end]
+
+            # The destination header separates file metadata from hunks;
+            # scanning past it also keeps '+++' out of the added lines
+            dest = _PATCH_DEST_RE.search(segment)
+            if not dest:
+                continue
+
+            kept_lines = _PATCH_KEEP_RE.findall(segment, dest.end())
+
+            # No surviving lines means the patch removes the file
+            files[file_path] = '\n'.join(kept_lines) if kept_lines else None
+
         return files
     
     def _delete_file(self, repo_name: str, file_path: str, commit_message: str, branch: str) -> Dict[str, Any]:
@@ -478,7 +783,7 @@ class GitHubTool:
             result = self._make_request('DELETE', url, json=data)
             
             if result.get('success'):
-                logger.info(f"Deleted file {file_path} from branch {branch}")
+                logger.info("Deleted file %s from branch %s", file_path, branch)
                 return {
                     'success': True,
                     'commit_sha': result['data'].get('commit', {}).get('sha')
@@ -487,7 +792,7 @@ class GitHubTool:
                 return result
                 
         except Exception as e:
-            logger.error(f"Error deleting file: {e}")
+            logger.error("Error deleting file: %s", e)
             return {
                 'success': False,
                 'error': f'File deletion failed: {str(e)}'
@@ -524,7 +829,7 @@ class GitHubTool:
             
             if result.get('success'):
                 pr_data = result['data']
-                logger.info(f"Created PR #{pr_data.get('number')}: {title}")
+                logger.info("Created PR #%s: %s", pr_data.get('number'), title)
                 return {
                     'success': True,
                     'pr_number': pr_data.get('number'),
@@ -535,7 +840,7 @@ class GitHubTool:
                 return result
                 
         except Exception as e:
-            logger.error(f"Error creating pull request: {e}")
+            logger.error("Error creating pull request: %s", e)
             return {
                 'success': False,
                 'error': f'PR creation failed: {str(e)}'
@@ -560,7 +865,7 @@ class GitHubTool:
             result = self._make_request('POST', url, json=data)
             
             if result.get('success'):
-                logger.info(f"Added labels {labels} to issue #{issue_number}")
+                logger.info("Added labels %s to issue #%s", labels, issue_number)
                 return {
                     'success': True,
                     'labels': result['data']
@@ -569,7 +874,7 @@ class GitHubTool:
                 return result
                 
         except Exception as e:
-            logger.error(f"Error adding labels: {e}")
+            logger.error("Error adding labels: %s", e)
             return {
                 'success': False,
                 'error': f'Label addition failed: {str(e)}'
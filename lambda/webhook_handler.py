@@ -5,20 +5,61 @@ This Lambda function receives GitHub webhook events and triggers the agent orche
 for autonomous issue resolution.
 """
 
+import base64
 import json
 import hmac
 import hashlib
 import os
 import logging
 import boto3
+import botocore.config
 from typing import Dict, Any
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-lambda_client = boto3.client('lambda')
+# Fast JSON codec: orjson (C-implemented) when available, stdlib otherwise
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj)
+
+# Initialize AWS clients; pooled connections persist across warm
+# invocations and retries stay bounded on the synchronous webhook path
+sqs_client = boto3.client('sqs', config=botocore.config.Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 2, 'mode': 'standard'}
+))
+
+# Cold-start constants: env values and decision sets resolved once
+_ISSUE_QUEUE_URL = os.environ.get('ISSUE_QUEUE_URL')
+_GITHUB_SECRET = os.environ.get('GITHUB_SECRET')
+_VALID_ACTIONS = frozenset({'opened', 'reopened', 'edited'})
+
+# Labels that route an issue to a human instead of the agent
+_SKIP_LABELS = frozenset({'needs-review', 'complex', 'breaking-change', 'security'})
+
+# Encoded webhook secret, cached so each event skips the re-encode
+_secret_bytes_cache: Dict[str, bytes] = {}
+
+def _get_secret_bytes(secret: str) -> bytes:
+    """Return the UTF-8 encoding of the webhook secret, cached."""
+    cached = _secret_bytes_cache.get(secret)
+    if cached is None:
+        cached = _secret_bytes_cache[secret] = secret.encode('utf-8')
+    return cached
 
 def verify_github_signature(payload: bytes, signature: str, secret: str) -> bool:
     """
@@ -39,16 +80,23 @@ def verify_github_signature(payload: bytes, signature: str, secret: str) -> bool
     # Remove 'sha256=' prefix if present
     if signature.startswith('sha256='):
         signature = signature[7:]
-    
-    # Calculate expected signature
-    expected_signature = hmac.new(
-        secret.encode('utf-8'),
+
+    # Decode the hex header once; comparing raw digests skips the
+    # hex-encode of our own HMAC and halves the compared bytes
+    try:
+        signature_bytes = bytes.fromhex(signature)
+    except ValueError:
+        logger.warning("Malformed signature header")
+        return False
+
+    expected_digest = hmac.new(
+        _get_secret_bytes(secret),
         payload,
         hashlib.sha256
-    ).hexdigest()
-    
+    ).digest()
+
     # Compare signatures securely
-    return hmac.compare_digest(signature, expected_signature)
+    return hmac.compare_digest(signature_bytes, expected_digest)
 
 def extract_issue_context(issue_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -66,7 +114,7 @@ def extract_issue_context(issue_data: Dict[str, Any]) -> Dict[str, Any]:
         'title': issue_data.get('title', ''),
         'body': issue_data.get('body', ''),
         'state': issue_data.get('state'),
-        'labels': [label.get('name', '') for label in issue_data.get('labels', [])],
+        'labels': [label['name'] for label in issue_data.get('labels', ()) if label.get('name')],
         'assignee': issue_data.get('assignee'),
         'created_at': issue_data.get('created_at'),
         'updated_at': issue_data.get('updated_at'),
@@ -114,19 +162,18 @@ def should_process_issue(issue_context: Dict[str, Any]) -> bool:
     """
     # Skip if issue is already assigned to a human
     if issue_context.get('assignee'):
-        logger.info(f"Issue #{issue_context.get('number')} already assigned, skipping")
+        logger.info("Issue #%s already assigned, skipping", issue_context.get('number'))
         return False
     
     # Skip if issue is closed
     if issue_context.get('state') == 'closed':
-        logger.info(f"Issue #{issue_context.get('number')} is closed, skipping")
+        logger.info("Issue #%s is closed, skipping", issue_context.get('number'))
         return False
     
     # Skip if issue has specific labels that indicate human intervention needed
-    skip_labels = ['needs-review', 'complex', 'breaking-change', 'security']
-    issue_labels = issue_context.get('labels', [])
-    if any(label in issue_labels for label in skip_labels):
-        logger.info(f"Issue #{issue_context.get('number')} has skip labels, skipping")
+    issue_labels = issue_context.get('labels', ())
+    if _SKIP_LABELS.intersection(issue_labels):
+        logger.info("Issue #%s has skip labels, skipping", issue_context.get('number'))
         return False
     
     # Process if issue is open and doesn't have skip labels
@@ -144,20 +191,30 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         dict: HTTP response
     """
     try:
-        # Extract request details
-        headers = event.get('headers', {})
+        # Extract request details; API Gateway v2 lowercases header
+        # names, so normalize once and index with lowercase keys
+        headers = {key.lower(): value for key, value in (event.get('headers') or {}).items()}
         body = event.get('body', '')
         is_base64 = event.get('isBase64Encoded', False)
         
         # Handle base64 encoded body
         if is_base64:
-            import base64
             body = base64.b64decode(body).decode('utf-8')
         
+        # Cheap predicate first: drop non-issue traffic (bots, probes,
+        # other event types) before paying for HMAC over the whole body
+        event_type = headers.get('x-github-event', '')
+        if event_type != 'issues':
+            logger.info("Event type %s not supported, skipping", event_type)
+            return {
+                'statusCode': 200,
+                'body': _dumps({'message': 'Event type not supported'})
+            }
+
         # Verify GitHub signature
-        github_secret = os.environ.get('GITHUB_SECRET')
-        signature = headers.get('X-Hub-Signature-256', '')
-        
+        github_secret = _GITHUB_SECRET
+        signature = headers.get('x-hub-signature-256', '')
+
         if github_secret and not verify_github_signature(
             body.encode('utf-8') if isinstance(body, str) else body,
             signature,
@@ -166,39 +223,30 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.warning("Invalid GitHub signature")
             return {
                 'statusCode': 401,
-                'body': json.dumps({'error': 'Invalid signature'})
+                'body': _dumps({'error': 'Invalid signature'})
             }
         
         # Parse webhook payload
         try:
-            payload = json.loads(body)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON payload: {e}")
+            payload = _loads(body)
+        except ValueError as e:
+            logger.error("Invalid JSON payload: %s", e)
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': 'Invalid JSON'})
+                'body': _dumps({'error': 'Invalid JSON'})
             }
         
         # Extract event information
-        event_type = headers.get('X-GitHub-Event', '')
         action = payload.get('action', '')
-        
-        logger.info(f"Received GitHub event: {event_type}.{action}")
-        
-        # Only process issue events
-        if event_type != 'issues':
-            logger.info(f"Event type {event_type} not supported, skipping")
-            return {
-                'statusCode': 200,
-                'body': json.dumps({'message': 'Event type not supported'})
-            }
-        
+
+        logger.info("Received GitHub event: %s.%s", event_type, action)
+
         # Only process specific issue actions
-        if action not in ['opened', 'reopened', 'edited']:
-            logger.info(f"Issue action {action} not supported, skipping")
+        if action not in _VALID_ACTIONS:
+            logger.info("Issue action %s not supported, skipping", action)
             return {
                 'statusCode': 200,
-                'body': json.dumps({'message': 'Action not supported'})
+                'body': _dumps({'message': 'Action not supported'})
             }
         
         # Extract issue and repository context
@@ -209,7 +257,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.error("Missing issue or repository data")
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': 'Missing required data'})
+                'body': _dumps({'error': 'Missing required data'})
             }
         
         issue_context = extract_issue_context(issue_data)
@@ -219,7 +267,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not should_process_issue(issue_context):
             return {
                 'statusCode': 200,
-                'body': json.dumps({'message': 'Issue not eligible for processing'})
+                'body': _dumps({'message': 'Issue not eligible for processing'})
             }
         
         # Prepare orchestrator payload
@@ -231,29 +279,29 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'timestamp': context.aws_request_id
         }
         
-        # Get orchestrator function name
-        orchestrator_function = os.environ.get('ORCHESTRATOR_FUNCTION')
-        if not orchestrator_function:
-            logger.error("ORCHESTRATOR_FUNCTION not configured")
+        # Get the queue feeding the orchestrator
+        issue_queue_url = _ISSUE_QUEUE_URL
+        if not issue_queue_url:
+            logger.error("ISSUE_QUEUE_URL not configured")
             return {
                 'statusCode': 500,
-                'body': json.dumps({'error': 'Configuration error'})
+                'body': _dumps({'error': 'Configuration error'})
             }
-        
-        # Invoke agent orchestrator asynchronously
-        logger.info(f"Invoking orchestrator for issue #{issue_context.get('number')}")
-        
-        response = lambda_client.invoke(
-            FunctionName=orchestrator_function,
-            InvocationType='Event',  # Asynchronous invocation
-            Payload=json.dumps(orchestrator_payload)
+
+        # Queue the event; SQS batches up to 10 issues into a single
+        # orchestrator invocation
+        logger.info("Queueing issue #%s for the orchestrator", issue_context.get('number'))
+
+        response = sqs_client.send_message(
+            QueueUrl=issue_queue_url,
+            MessageBody=_dumps(orchestrator_payload)
         )
-        
-        logger.info(f"Orchestrator invoked successfully: {response.get('StatusCode')}")
+
+        logger.info("Issue queued successfully: %s", response.get('MessageId'))
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': _dumps({
                 'message': 'Issue queued for processing',
                 'issue_number': issue_context.get('number'),
                 'repository': repo_context.get('full_name')
@@ -261,10 +309,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}", exc_info=True)
+        logger.error("Error processing webhook: %s", str(e), exc_info=True)
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': _dumps({
                 'error': 'Internal server error',
                 'message': str(e)
             })